@@ -0,0 +1,5 @@
+"""
+Aerofoil definitions.
+
+Copyright (c) 2019 Jan Niklas Rose
+"""
@@ -0,0 +1,124 @@
+"""
+NACA 4-series aerofoil geometry.
+
+Definition: https://en.wikipedia.org/wiki/NACA_airfoil#Four-digit_series
+See also: "Theory of wing sections" by Abbott
+
+Copyright (c) 2019 Jan Niklas Rose
+"""
+
+### LIBRARIES ###
+
+import math      # https://docs.python.org/2/library/math.html
+
+import numpy as np  # https://numpy.org/doc/stable/
+
+
+### CALCULATE AEROFOIL ###
+
+def camberline_x(N=100, spacing='cos', dtype=np.float64):
+    """Return N camberline x-coordinates in [0, 1] with the given spacing."""
+    # (transformed in place, so only a single array is allocated)
+    if spacing == 'cos':
+        x = np.linspace(0.0, math.pi, N, dtype=dtype)
+        np.cos(x, out=x)
+        x *= -0.5
+        x += 0.5
+    elif spacing == '2cos':
+        x = np.linspace(0.0, math.pi/2.0, N, dtype=dtype)
+        np.cos(x, out=x)
+        np.subtract(1.0, x, out=x)
+    elif spacing == 'lin':
+        x = np.linspace(0.0, 1.0, N, dtype=dtype)
+    else:
+        raise ValueError("unknown spacing %r" % spacing)
+    return x
+
+def parse_naca4(MPTT):
+    """Return (M, P, T) as fractions of the chord from a 4 digit code."""
+    M = int(MPTT[0])/100.0    # maximum camber
+    P = int(MPTT[1])/10.0     # location of maximum camber
+    T = int(MPTT[2:4])/100.0  # maximum thickness
+    if (M != 0) and (P == 0):
+        # the camber line is undefined with its maximum at the LE
+        raise ValueError("%r is cambered but has no location of maximum "
+                         "camber" % MPTT)
+    return M, P, T
+
+# thickness (x must be an ndarray, its dtype sets the working precision)
+def thickness(x, tc):
+    """Return the half thickness at the points x for tc = T/0.20."""
+    d = x.dtype.type  # constants in the precision of x
+    # (Horner form of -0.1260 x - 0.3516 x^2 + 0.2843 x^3 - 0.1015 x^4)
+    poly = x*(d(-0.1260) + x*(d(-0.3516) + x*(d(0.2843) - d(0.1015)*x)))
+    return tc*(d(0.2969)*np.sqrt(x) + poly)
+
+def camber(x, P, c_front, c_back):
+    """Return (y_c, dy_c/dx) with the camber factors for x <= P and x > P."""
+    # piecewise in x at the location of maximum camber
+    front = (0 <= x) & (x <= P)
+    y_c = np.where(front,
+        c_front*(2*P*x-x**2),
+        c_back*((1-2*P)+2*P*x-x**2))
+    dycdx = np.where(front, c_front, c_back)
+    dycdx *= 2*(P-x)
+    return y_c, dycdx
+
+def compute_coords(x, M, P, T):
+    """Return rows (x_C, y_C, x_U, y_U, x_L, y_L) at the camberline points x."""
+    # constants in the precision of x (otherwise float32 scalars may be
+    # promoted to float64)
+    d = x.dtype.type
+    # one contiguous block, with a view per coordinate
+    coords = np.empty((6, len(x)), dtype=x.dtype)
+    x_C = coords[0]
+    y_C = coords[1]
+    x_U = coords[2]
+    y_U = coords[3]
+    x_L = coords[4]
+    y_L = coords[5]
+    y_t = thickness(x, T/d(0.20))
+    # mean camber line
+    x_C[:] = x
+    if M == 0:
+        # symmetrical aerofoils skip the camber terms (theta = 0)
+        y_C[:] = 0.0
+        # upper surface
+        x_U[:] = x
+        y_U[:] = y_t
+        # lower surface
+        x_L[:] = x
+        y_L[:] = -y_t
+        return coords
+    # cambered
+    c_front = M/(P*P) if P != 0 else d(0)              # factor for x <= P
+    c_back = M/((d(1)-P)*(d(1)-P)) if P != 1 else d(0)  # factor for x > P
+    y_c, dycdx = camber(x, P, c_front, c_back)
+    # coordinates (with theta = atan(dycdx), using
+    # cos(theta) = 1/sqrt(1+dycdx^2) and sin(theta) = dycdx*cos(theta))
+    cos_theta = d(1)/np.sqrt(d(1) + dycdx*dycdx)
+    sin_theta = dycdx*cos_theta
+    y_C[:] = y_c
+    # upper surface
+    x_U[:] = x - y_t*sin_theta
+    y_U[:] = y_c + y_t*cos_theta
+    # lower surface
+    x_L[:] = x + y_t*sin_theta
+    y_L[:] = y_c - y_t*cos_theta
+    return coords
+
+def compute_naca4(MPTT, res=100, spacing='cos', dtype=np.float64):
+    """Return rows (x_C, y_C, x_U, y_U, x_L, y_L) of a NACA 4-series aerofoil."""
+    x = camberline_x(res, spacing, dtype)
+    M, P, T = (dtype(value) for value in parse_naca4(MPTT))
+    return compute_coords(x, M, P, T)
+
+def compute_naca4_batch(MPTTs, res=100, spacing='cos', dtype=np.float64):
+    """Return an array of shape (len(MPTTs), 6, res), see compute_naca4."""
+    # (the camberline points are shared by all aerofoils)
+    x = camberline_x(res, spacing, dtype)
+    out = np.empty((len(MPTTs), 6, res), dtype=dtype)
+    for k, MPTT in enumerate(MPTTs):
+        M, P, T = (dtype(value) for value in parse_naca4(MPTT))
+        out[k] = compute_coords(x, M, P, T)
+    return out
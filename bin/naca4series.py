@@ -13,9 +13,17 @@ Copyright (c) 2019 Jan Niklas Rose
 ### LIBRARIES ###
 
 import sys       # https://docs.python.org/2/library/sys.html
+import os        # https://docs.python.org/2/library/os.html
 import argparse  # https://docs.python.org/2/library/argparse.html
-import csv       # https://docs.python.org/2/library/csv.html
-import math      # https://docs.python.org/2/library/math.html
+import collections  # https://docs.python.org/2/library/collections.html
+
+import numpy as np  # https://numpy.org/doc/stable/
+
+# shared aerofoil module, from the checkout this script is in
+# (put first, so that an installed aerofoil module is not used instead)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from aerofoil.naca4 import parse_naca4, compute_naca4, compute_naca4_batch
 
 
 ### PARSE ARGUMENTS ###
@@ -25,8 +33,24 @@ def valid_naca4(string):
     if (len(string) != 4) or (not string.isdigit()):
         msg = "%r is not a 4 digit NACA aerofoil definition" % string
         raise argparse.ArgumentTypeError(msg)
+    try:
+        parse_naca4(string)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err))
     return string
 
+# validator for the camber line resolution
+def valid_resolution(string):
+    try:
+        value = int(string)
+    except ValueError:
+        msg = "%r is not an integer" % string
+        raise argparse.ArgumentTypeError(msg)
+    if value < 3:
+        msg = "%r is less than the minimum of 3 points" % string
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
 # command line parser
 parser = argparse.ArgumentParser(
     prog='naca4series',
@@ -36,14 +60,23 @@ parser = argparse.ArgumentParser(
 
 # parser group for aerofoil definition
 group_def = parser.add_argument_group('Aerofoil definition')
-group_def.add_argument(
+# (MPTT is validated after parsing, so that a FILE.csv given with --batch is
+# reported as a conflict rather than as an invalid MPTT)
+group_MPTT = group_def.add_mutually_exclusive_group(required=True)
+group_MPTT.add_argument(
     'MPTT', metavar='MPTT',
-    type=valid_naca4,
+    nargs='?', type=str,
     help='4 digits specifying MPTT (e.g. 0012)'
 )
+group_MPTT.add_argument(
+    '-b', '--batch', dest='batch', metavar='FILE.txt',
+    type=argparse.FileType('r'),
+    help='file with one MPTT per line instead of a single MPTT, '
+         'each aerofoil is written to nacaMPTT.csv in DIR'
+)
 group_def.add_argument(
     '-r', '--resolution', dest='res', metavar='N',
-    type=int, default='100', choices=range(3, 1000),
+    type=valid_resolution, default='100',
     help='number of points on camber line (default: %(default)s)'
 )
 group_def.add_argument(
@@ -74,122 +107,116 @@ group_def.add_argument(
 
 # parser group for input/output
 group_IO = parser.add_argument_group('Output')
+group_IO.add_argument(
+    '--fp32', dest='fp32',
+    action='store_true',
+    help='calculate and write in single precision (default: false)'
+)
+group_IO.add_argument(
+    '-o', '--outdir', dest='outdir', metavar='DIR',
+    type=str,
+    help='directory to write to with --batch (default: current directory)'
+)
+group_IO.add_argument(
+    '-f', '--force', dest='force',
+    action='store_true',
+    help='overwrite existing files in DIR with --batch (default: false)'
+)
+# (opened only after all arguments are checked, so that an error does not
+# truncate an existing file)
 group_IO.add_argument(
     'outfile', metavar='FILE.csv',
-    nargs='?', type=argparse.FileType('w'), default=sys.stdout,
-    help='file to write to (default: stdout)'
+    nargs='?', type=str,
+    help='file to write to, not with --batch (default: stdout)'
 )
 
 # process
 args = parser.parse_args()  # reads from sys.argv
+if args.batch is None:
+    try:
+        valid_naca4(args.MPTT)
+    except argparse.ArgumentTypeError as err:
+        parser.error("argument MPTT: %s" % err)
+    if (args.outdir is not None) or args.force:
+        parser.error("--outdir and --force can only be used with --batch")
+    MPTTs = [args.MPTT]
+    if args.outfile is None:
+        outfile = sys.stdout
+    else:
+        try:
+            outfile = open(args.outfile, 'w')
+        except OSError as err:
+            parser.error("can't open %r: %s" % (args.outfile, err))
+else:
+    MPTTs = [line.strip() for line in args.batch if line.strip()]
+    args.batch.close()
+    if not MPTTs:
+        parser.error("%s: no aerofoil definitions" % args.batch.name)
+    for MPTT in MPTTs:
+        try:
+            valid_naca4(MPTT)
+        except argparse.ArgumentTypeError as err:
+            parser.error("%s: %s" % (args.batch.name, err))
+    counts = collections.Counter(MPTTs)
+    duplicates = sorted(MPTT for MPTT, count in counts.items() if count > 1)
+    if duplicates:
+        parser.error("%s: duplicate definitions %s"
+                     % (args.batch.name, ', '.join(duplicates)))
+    outdir = os.curdir if args.outdir is None else args.outdir
+    if not os.path.isdir(outdir):
+        parser.error("%r is not a directory" % outdir)
+    outfiles = [os.path.join(outdir, 'naca%s.csv' % MPTT) for MPTT in MPTTs]
+    if not args.force:
+        for outfile in outfiles:
+            if os.path.exists(outfile):
+                parser.error("%r exists (use --force to overwrite)" % outfile)
 
 
 ### CALCULATE AEROFOIL ###
 
-# auxiliary functions (to avoid using NumPy)
-def linspace(a, b, N=100):
-    if N == 1:
-        return b
-    h = (b - a) / (N - 1)
-    return [a + h*n  for n in range(N)]
-def cos(x):
-    # using https://docs.python.org/2/library/functions.html#map
-    return map(math.cos, x)
-def dealzeros(N, M):
-    return [[0]*N for _ in range(M)]
-
-# camberline x-coordinates
-if args.spacing == 'cos':
-    x = [(1.0-xi)/2.0  for xi in cos(linspace(0.0, math.pi, args.res))]
-elif args.spacing == '2cos':
-    x = [1.0-xi  for xi in cos(linspace(0.0, math.pi/2.0, args.res))]
-elif args.spacing == 'lin':
-    x = linspace(0.0, 1.0, args.res)
-
-# extract values from NACA definition
-M = float(args.MPTT[0])/100    # maximum camber
-P = float(args.MPTT[1])/10     # percentage location of maximum thickness
-T = float(args.MPTT[2:3])/100  # maximum thickness
-
-# calculate 
-Npts = len(x)
-x_C, y_C, x_U, y_U, x_L, y_L = dealzeros(Npts, 6)  # initialise all
-for i in range(Npts):
-    x_c = x[i]
-
-    # thickness
-    y_t = T/0.20 * ( 0.2969 * math.sqrt(x_c)
-                   - 0.1260 * x_c
-                   - 0.3516 * x_c**2
-                   + 0.2843 * x_c**3
-                   - 0.1015 * x_c**4 )
-    if M==0 and P==0:
-        # symmetrical
-        y_c = 0
-        dycdx = 0
-    else:
-        # cambered
-        if (0 <= x_c) and (x_c <= P):
-            y_c = M/(P**2)*(2*P*x_c-x_c**2)
-            dycdx = 2*M/(P**2)*(P-x_c)
-        else:
-            y_c = M/((1-P)**2)*((1-2*P)+2*P*x_c-x_c**2)
-            dycdx = 2*M/((1-P)**2)*(P-x_c)
-    # coordinates
-    theta = math.atan(dycdx)
-    # mean camber line
-    x_C[i] = x_c
-    y_C[i] = y_c
-    # upper surface
-    x_U[i] = x_c - y_t*math.sin(theta)
-    y_U[i] = y_c + y_t*math.cos(theta)
-    # lower surface
-    x_L[i] = x_c + y_t*math.sin(theta)
-    y_L[i] = y_c - y_t*math.cos(theta)
+# calculate
+dtype = np.float32 if args.fp32 else np.float64
+if args.batch is None:
+    aerofoils = [compute_naca4(args.MPTT, args.res, args.spacing, dtype)]
+else:
+    # all aerofoils at once
+    aerofoils = compute_naca4_batch(MPTTs, args.res, args.spacing, dtype)
 
 
 ### EXPORT DATA ###
 
-# prepare file
-writer = csv.writer(
-    args.outfile,
-    delimiter=',',
-    quotechar='|',
-    quoting=csv.QUOTE_MINIMAL
-)
-# don't write a header row ["x","y","z"], to be universally readable!
-
-for i in range(2*Npts):  # 2x for both lower and upper
+# column order of x, y, z for each plane
+perm = {'xy': (0, 1, 2), 'xz': (0, 2, 1), 'yz': (2, 0, 1)}[args.plane]
 
+def write_aerofoil(outfile, coords):
+    # rows of coords are (x_C, y_C, x_U, y_U, x_L, y_L)
     if args.meancamberline:
         # only print the mean camber line (x_C and y_C)
-        if i >= Npts:
-            continue
-        x_i = x_C[i]
-        y_i = y_C[i]
+        xy = coords[0:2].T
     else:
-        if i < Npts:
-            # go backwards
-            x_i = x_U[-1-i]
-            y_i = y_U[-1-i]
-        elif i == Npts:
-            continue  # skip this one (duplicate LE)
-            #NOTE: TE is not closed by definition
-        else:
-            # go forward
-            x_i = x_L[i-Npts]
-            y_i = y_L[i-Npts]
+        # go backwards along the upper and forward along the lower surface,
+        # skipping the duplicate LE
+        #NOTE: TE is not closed by definition
+        xy = np.concatenate([coords[2:4, ::-1], coords[4:6, 1:]], axis=1).T
 
     # transform
-    x_i *= args.chord
-    y_i *= args.chord
-    z_i = args.zval
-
-    # assign to correct plane and write data point
-    if args.plane == 'xy':
-        row = [x_i, y_i, z_i]
-    elif args.plane == 'xz':
-        row = [x_i, z_i, y_i]
-    elif args.plane == 'yz':
-        row = [z_i, x_i, y_i]
-    writer.writerow(row)
+    xy = xy * args.chord
+    xs = xy[:, 0]
+    ys = xy[:, 1]
+    zs = np.full_like(xs, args.zval)
+
+    # assign to correct plane
+    data = np.column_stack([xs, ys, zs])[:, perm]
+
+    # write all data points at once
+    # don't write a header row ["x","y","z"], to be universally readable!
+    # (%s gives the shortest repr that reproduces each value exactly)
+    np.savetxt(outfile, data, fmt='%s', delimiter=',')
+
+
+if args.batch is None:
+    write_aerofoil(outfile, aerofoils[0])
+else:
+    for path, coords in zip(outfiles, aerofoils):
+        with open(path, 'w') as outfile:
+            write_aerofoil(outfile, coords)
@@ -0,0 +1,74 @@
+"""
+Regression checks for the NACA 4-series geometry.
+
+Copyright (c) 2019 Jan Niklas Rose
+"""
+
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+from aerofoil.naca4 import (camberline_x, parse_naca4, compute_naca4,
+                            compute_naca4_batch)
+
+
+def reference_naca4(MPTT, res):
+    """Closed form coordinates, evaluated point by point with atan."""
+    M, P, T = parse_naca4(MPTT)
+    coords = []
+    for x_c in camberline_x(res):
+        y_t = T/0.20 * (0.2969*math.sqrt(x_c) - 0.1260*x_c - 0.3516*x_c**2
+                        + 0.2843*x_c**3 - 0.1015*x_c**4)
+        if M == 0:
+            y_c, dycdx = 0.0, 0.0
+        elif x_c <= P:
+            y_c = M/P**2*(2*P*x_c - x_c**2)
+            dycdx = 2*M/P**2*(P - x_c)
+        else:
+            y_c = M/(1-P)**2*((1-2*P) + 2*P*x_c - x_c**2)
+            dycdx = 2*M/(1-P)**2*(P - x_c)
+        theta = math.atan(dycdx)
+        coords.append((x_c, y_c,
+                       x_c - y_t*math.sin(theta), y_c + y_t*math.cos(theta),
+                       x_c + y_t*math.sin(theta), y_c - y_t*math.cos(theta)))
+    return np.array(coords).T
+
+
+def test_parse_naca4():
+    assert parse_naca4('2412') == (0.02, 0.4, 0.12)
+    assert parse_naca4('0012') == (0.0, 0.0, 0.12)
+
+def test_parse_naca4_rejects_camber_without_location():
+    with pytest.raises(ValueError):
+        parse_naca4('1012')
+
+def test_symmetric_thickness():
+    x_C, y_C, x_U, y_U, x_L, y_L = compute_naca4('0012', res=1000)
+    assert np.max(y_U - y_L) == pytest.approx(0.12, abs=1e-4)
+    assert np.all(y_C == 0)
+    assert np.array_equal(y_U, -y_L)
+
+@pytest.mark.parametrize('MPTT', ['0012', '2412', '4415', '0412', '9940'])
+def test_matches_reference(MPTT):
+    coords = compute_naca4(MPTT, res=101)
+    assert coords.shape == (6, 101)
+    np.testing.assert_allclose(coords, reference_naca4(MPTT, 101),
+                               rtol=0, atol=1e-12)
+
+def test_single_precision():
+    coords = compute_naca4('2412', res=101, dtype=np.float32)
+    assert coords.dtype == np.float32
+    np.testing.assert_allclose(coords, reference_naca4('2412', 101),
+                               rtol=0, atol=1e-6)
+
+def test_batch_matches_single():
+    MPTTs = ['0012', '2412', '4415']
+    coords = compute_naca4_batch(MPTTs, res=51)
+    assert coords.shape == (3, 6, 51)
+    for MPTT, batch_coords in zip(MPTTs, coords):
+        assert np.array_equal(batch_coords, compute_naca4(MPTT, res=51))